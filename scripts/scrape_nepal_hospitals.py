@@ -13,6 +13,7 @@ Data Sources:
 import csv
 import json
 import re
+import sys
 import time
 import zipfile
 import io
@@ -272,91 +273,206 @@ def scrape_health_info_portal() -> list[dict]:
     return hospitals
 
 
-def fetch_arcgis_hospitals() -> list[dict]:
+ARCGIS_LAYER_URL = (
+    "https://services7.arcgis.com/arZnhQhtvIXpgVPD/ArcGIS/rest/services"
+    "/Access_to_Health_Facilities_in_Nepal_WFL1/FeatureServer/2"
+)
+ARCGIS_OUT_FIELDS = ["HF_TYPE", "DIST_NAME", "VDC_NAME1", "ProvNum"]
+
+# HF_TYPE substrings that mark a hospital-level facility (used both for the
+# server-side where clause and the client-side _is_hospital_level flag). Hosted
+# layers run LIKE case-insensitively, so the server may return a few extra rows
+# (e.g. "DIstrict Cold Room") that the case-sensitive client check then drops.
+ARCGIS_HOSPITAL_KEYWORDS = [
+    "Hospital", "Zonal", "District", "Regional", "Sub Regional",
+    "Provincial", "Central", "Teaching", "DPHO", "Primary Health",
+]
+
+
+def _is_hospital_level(hf_type: str) -> bool:
+    return any(x in hf_type for x in ARCGIS_HOSPITAL_KEYWORDS)
+
+
+def build_arcgis_query(
+    include_health_posts: bool = False,
+    return_geometry: bool = False,
+    offset: int = 0,
+    batch: int = 2000,
+    quantize: bool = True,
+) -> dict:
     """
-    Fetch health facilities from Government ArcGIS API.
-    Filters for Hospital, Zonal, District, Regional, Sub-Regional, etc.
+    Build ArcGIS query params with the type filter and field list pushed to the server.
+    Hospital-level only unless include_health_posts; geometry is quantized to ~1e-6 deg
+    (or sent as 6-decimal degrees with quantize=False).
+    """
+    if include_health_posts:
+        where = "HF_TYPE IS NOT NULL AND HF_TYPE <> ''"
+    else:
+        # "Sub Regional" is already matched by "Regional"
+        keywords = [k for k in ARCGIS_HOSPITAL_KEYWORDS if k != "Sub Regional"]
+        where = " OR ".join(f"HF_TYPE LIKE '%{k}%'" for k in keywords)
+
+    params = {
+        "where": where,
+        "outFields": ",".join(ARCGIS_OUT_FIELDS),
+        "returnGeometry": "true" if return_geometry else "false",
+        "resultOffset": offset,
+        "resultRecordCount": batch,
+        "f": "json",
+    }
+    if return_geometry:
+        params["outSR"] = 4326
+    if return_geometry and not quantize:
+        params["geometryPrecision"] = 6
+    elif return_geometry:
+        params["quantizationParameters"] = json.dumps({
+            "mode": "edit",
+            "originPosition": "upperLeft",
+            "tolerance": 0.000001,
+            "extent": {
+                "xmin": 80.0, "ymin": 26.3, "xmax": 88.3, "ymax": 30.5,
+                "spatialReference": {"wkid": 4326},
+            },
+        })
+    return params
+
+
+def _dequantize_point(geom: dict, transform: Optional[dict]) -> tuple[Optional[float], Optional[float]]:
+    """
+    Turn a quantized ArcGIS point (grid ints + response transform) into (lon, lat).
+    Without a transform the point is already in degrees.
+
+    >>> t = {"originPosition": "upperLeft", "scale": [0.000001, 0.000001],
+    ...      "translate": [80.0, 30.5]}
+    >>> lon, lat = _dequantize_point({"x": 3980000, "y": 2300000}, t)
+    >>> round(lon, 6), round(lat, 6)
+    (83.98, 28.2)
+    >>> _dequantize_point({"x": 83.98, "y": 28.2}, None)
+    (83.98, 28.2)
     """
-    base = "https://services7.arcgis.com/arZnhQhtvIXpgVPD/ArcGIS/rest/services"
-    layer_url = f"{base}/Access_to_Health_Facilities_in_Nepal_WFL1/FeatureServer/2"
+    qx, qy = geom.get("x"), geom.get("y")
+    if qx is None or qy is None:
+        return (None, None)
+    if not transform:
+        return (qx, qy)
+    scale = transform["scale"]
+    translate = transform["translate"]
+    x = translate[0] + qx * scale[0]
+    if transform.get("originPosition", "upperLeft") == "upperLeft":
+        y = translate[1] - qy * scale[1]
+    else:
+        y = translate[1] + qy * scale[1]
+    return (x, y)
 
-    # Hospital-like types
-    hospital_types = [
-        "Hospital", "Zonal Hospital", "District Hospital", "Regional Hospital",
-        "Sub Regional Hospital", "Provincial Hospital", "Central Hospital",
-        "Teaching Hospital", "DPHO",
-    ]
 
-    all_features = []
+def _arcgis_feature_to_hospital(feat: dict, transform: Optional[dict] = None) -> Optional[dict]:
+    attrs = feat.get("attributes", {})
+    hf_type = attrs.get("HF_TYPE") or ""
+    if not hf_type:
+        return None
+    dist = attrs.get("DIST_NAME") or ""
+    vdc = attrs.get("VDC_NAME1") or ""
+    prov_num = attrs.get("ProvNum")
+    province = get_province_from_number(prov_num)
+    address = f"{vdc}, {dist}, Nepal" if vdc and dist else (f"{vdc}, Nepal" if vdc else (f"{dist}, Nepal" if dist else ""))
+
+    name = f"{hf_type} - {vdc}, {dist}" if vdc and dist else f"{hf_type} - {dist}"
+
+    lon, lat = _dequantize_point(feat.get("geometry") or {}, transform)
+
+    return {
+        "name": name,
+        "province": province or "",
+        "district": dist,
+        "address": address,
+        "hospital_type": hf_type,
+        "image_url": None,
+        "source": "ArcGIS",
+        # Only include hospital-level facilities (skip Health Post for "hospitals" list)
+        "_is_hospital_level": _is_hospital_level(hf_type),
+        "latitude": round(lat, 6) if lat is not None else None,
+        "longitude": round(lon, 6) if lon is not None else None,
+    }
+
+
+def _fetch_arcgis_pages(
+    params_for_offset, stats: Optional[dict] = None
+) -> tuple[list[dict], Optional[dict]]:
+    """
+    Page through the ArcGIS layer. params_for_offset(offset) -> query params.
+    Returns (features, transform); transform is only set for quantized geometry.
+    """
+    features_out = []
+    transform = None
     offset = 0
-    batch = 2000
-
-    where_clause = "HF_TYPE IN ('Hospital','DPHO','Primary Health Center','Health Post') OR HF_TYPE LIKE '%Hospital%' OR HF_TYPE LIKE '%Zonal%' OR HF_TYPE LIKE '%District%'"
-    # Simplify: get all facility types, filter later
-    where_clause = "1=1"
 
     while True:
-        url = (
-            f"{layer_url}/query?where={where_clause}"
-            f"&outFields=HF_TYPE,DIST_NAME,VDC_NAME1,ProvNum"
-            f"&returnGeometry=false"
-            f"&resultOffset={offset}"
-            f"&resultRecordCount={batch}"
-            f"&f=json"
-        )
+        params = params_for_offset(offset)
         try:
-            resp = requests.get(url, timeout=60, headers=HEADERS)
+            started = time.perf_counter()
+            resp = requests.get(f"{ARCGIS_LAYER_URL}/query", params=params, timeout=60, headers=HEADERS)
+            body = resp.content
+            elapsed = time.perf_counter() - started
             data = resp.json()
         except Exception as e:
             print(f"[ArcGIS] Error: {e}")
             break
+        if stats is not None:
+            # Wall-clock time per page, including the body download
+            stats["bytes"] = stats.get("bytes", 0) + len(body)
+            stats["requests"] = stats.get("requests", 0) + 1
+            stats["seconds"] = stats.get("seconds", 0.0) + elapsed
+
+        # ArcGIS reports query errors (e.g. a rejected where clause) with HTTP 200
+        if data.get("error"):
+            print(f"[ArcGIS] Error: {data['error']}")
+            break
 
+        # The transform follows from the fixed extent we send, so it is the same on every page
+        transform = transform or data.get("transform")
         features = data.get("features", [])
         if not features:
             break
-
-        for f in features:
-            attrs = f.get("attributes", {})
-            hf_type = attrs.get("HF_TYPE") or ""
-            if not hf_type:
-                continue
-            dist = attrs.get("DIST_NAME") or ""
-            vdc = attrs.get("VDC_NAME1") or ""
-            prov_num = attrs.get("ProvNum")
-            province = get_province_from_number(prov_num)
-            address = f"{vdc}, {dist}, Nepal" if vdc and dist else (f"{vdc}, Nepal" if vdc else (f"{dist}, Nepal" if dist else ""))
-
-            # Only include hospital-level facilities (skip Health Post for "hospitals" list)
-            is_hospital = any(
-                x in hf_type for x in
-                ["Hospital", "Zonal", "District", "Regional", "Sub Regional",
-                 "Provincial", "Central", "Teaching", "DPHO", "Primary Health"]
-            )
-
-            name = f"{hf_type} - {vdc}, {dist}" if vdc and dist else f"{hf_type} - {dist}"
-
-            all_features.append({
-                "name": name,
-                "province": province or "",
-                "district": dist,
-                "address": address,
-                "hospital_type": hf_type,
-                "image_url": None,
-                "source": "ArcGIS",
-                "_is_hospital_level": is_hospital,
-                "latitude": None,
-                "longitude": None,
-            })
+        features_out.extend(features)
         offset += len(features)
-        if len(features) < batch:
+        if len(features) < params["resultRecordCount"] and not data.get("exceededTransferLimit"):
             break
         time.sleep(0.3)
 
-    # Deduplicate by (district, vdc, type) - ArcGIS may have duplicates
+    if stats is not None:
+        stats["features"] = len(features_out)
+    return features_out, transform
+
+
+def fetch_arcgis_hospitals(
+    include_health_posts: bool = False,
+    return_geometry: bool = False,
+    stats: Optional[dict] = None,
+    quantize: bool = True,
+) -> list[dict]:
+    """
+    Fetch health facilities from Government ArcGIS API.
+    Filters for Hospital, Zonal, District, Regional, Sub-Regional, etc. on the server;
+    set include_health_posts=True to also pull Health Posts and other lower tiers.
+    Pass a dict as stats to collect bytes/requests/seconds/features for the pull.
+    """
+    batch = 2000
+    features, transform = _fetch_arcgis_pages(
+        lambda offset: build_arcgis_query(include_health_posts, return_geometry, offset, batch, quantize),
+        stats,
+    )
+
+    # Deduplicate by (district, vdc, type) - ArcGIS may have duplicates.
+    # With geometry, facilities of one type in one VDC are told apart by location.
     seen = set()
     unique = []
-    for h in all_features:
+    for feat in features:
+        h = _arcgis_feature_to_hospital(feat, transform)
+        if h is None:
+            continue
         key = (h["district"], h["address"], h["hospital_type"])
+        if return_geometry:
+            key += (h["latitude"], h["longitude"])
         if key not in seen:
             seen.add(key)
             unique.append(h)
@@ -364,6 +480,63 @@ def fetch_arcgis_hospitals() -> list[dict]:
     return unique
 
 
+def benchmark_arcgis_fetch() -> dict:
+    """
+    Compare the old full pull (where=1=1, all types) with the pull main() now does
+    (all tiers, filtered fields) and with the hospital-only tier on its own, then
+    the all-tier pull with geometry as 6-decimal degrees vs quantized.
+    Times are wall-clock, including the body download.
+    """
+    batch = 2000
+
+    def old_params(offset: int) -> dict:
+        return {
+            "where": "1=1",
+            "outFields": ",".join(ARCGIS_OUT_FIELDS),
+            "returnGeometry": "false",
+            "resultOffset": offset,
+            "resultRecordCount": batch,
+            "f": "json",
+        }
+
+    old, main_pull, hospital_only, geom_plain, geom_quantized = {}, {}, {}, {}, {}
+    _fetch_arcgis_pages(old_params, old)
+    fetch_arcgis_hospitals(include_health_posts=True, stats=main_pull)
+    fetch_arcgis_hospitals(include_health_posts=False, stats=hospital_only)
+    fetch_arcgis_hospitals(include_health_posts=True, return_geometry=True, stats=geom_plain, quantize=False)
+    fetch_arcgis_hospitals(include_health_posts=True, return_geometry=True, stats=geom_quantized)
+
+    def report(label: str, s: dict) -> None:
+        print(f"[ArcGIS] {label}: {s.get('features', 0)} features, "
+              f"{s.get('bytes', 0) / 1024:.1f} KiB in {s.get('requests', 0)} requests, "
+              f"{s.get('seconds', 0):.2f}s wall-clock")
+
+    def compare(label: str, s: dict, base_label: str, base: dict) -> None:
+        if base.get("bytes"):
+            saved = 1 - s.get("bytes", 0) / base["bytes"]
+            print(f"[ArcGIS] {label} vs {base_label}: saved {saved:.0%} of bytes, "
+                  f"{base.get('seconds', 0) - s.get('seconds', 0):.2f}s wall-clock")
+
+    report("old full pull (1=1)", old)
+    report("main() pull (all tiers)", main_pull)
+    report("hospital-only tier", hospital_only)
+    compare("main() pull", main_pull, "old", old)
+    compare("hospital-only tier", hospital_only, "old", old)
+
+    report("all tiers + geometry (6-decimal degrees)", geom_plain)
+    report("all tiers + geometry (quantized)", geom_quantized)
+    compare("quantized geometry", geom_quantized, "6-decimal degrees", geom_plain)
+    compare("geometry off", main_pull, "quantized geometry", geom_quantized)
+
+    return {
+        "old": old,
+        "main": main_pull,
+        "hospital_only": hospital_only,
+        "geometry_plain": geom_plain,
+        "geometry_quantized": geom_quantized,
+    }
+
+
 def scrape_nssd(verify_ssl: bool = True) -> list[dict]:
     """Scrape NSSD (nssd.dohs.gov.np) for province-wise hospital names.
     Set verify_ssl=False if the site has certificate issues (e.g. expired cert).
@@ -581,7 +754,8 @@ def main():
     print(f"  Found {len(hip)} hospitals")
 
     print("Fetching from Government ArcGIS API...")
-    arcgis = fetch_arcgis_hospitals()
+    # Both the hospital list and the full list are written, so pull every tier once
+    arcgis = fetch_arcgis_hospitals(include_health_posts=True)
     print(f"  Found {len(arcgis)} health facilities")
 
     print("Scraping NSSD...")
@@ -622,4 +796,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark-arcgis" in sys.argv:
+        benchmark_arcgis_fetch()
+    else:
+        main()